@@ -2,13 +2,17 @@ import sys
 import cv2
 import os
 import platform
+import time
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel,
                              QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout,
                              QSlider, QShortcut, QSizePolicy, QFrame, QToolTip,
-                             QSpacerItem, QMenu, QAction)
-from PyQt5.QtGui import QImage, QPixmap, QKeySequence, QFont, QPalette, QColor
-from PyQt5.QtCore import Qt, QTimer, pyqtSlot, QSize, QUrl, QMimeData, QSettings
+                             QSpacerItem, QMenu, QAction, QCheckBox, QSpinBox,
+                             QDialog, QInputDialog, QRubberBand)
+from PyQt5.QtGui import (QImage, QPixmap, QKeySequence, QFont, QPalette, QColor,
+                         QPainter, QPen, QPolygonF)
+from PyQt5.QtCore import (Qt, QTimer, pyqtSlot, QSize, QUrl, QMimeData, QSettings,
+                          QThread, QMutex, QWaitCondition, pyqtSignal, QRect, QPointF)
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QAudio, QMediaPlayer
 from PyQt5.QtMultimediaWidgets import QVideoWidget
 
@@ -22,6 +26,336 @@ MAX_RECENT_FILES = 10
 ROTATE_90_CLOCKWISE = cv2.ROTATE_90_CLOCKWISE
 ROTATE_180 = cv2.ROTATE_180
 ROTATE_90_COUNTERCLOCKWISE = cv2.ROTATE_90_COUNTERCLOCKWISE
+# ROTATE: Angle -> cv2 rotation applied by display_frame (also used by the scopes and ROI mapping)
+ROTATION_FOR_ANGLE = {90: ROTATE_90_COUNTERCLOCKWISE, 180: ROTATE_180, 270: ROTATE_90_CLOCKWISE}
+
+# SCOPES: Constants for the histogram / waveform / vectorscope panel
+SCOPE_RATE_KEY = "scopeUpdateRate"
+DEFAULT_SCOPE_RATE_HZ = 10
+SCOPE_SAMPLE_MAX_DIM = 320 # Longest side of the subsampled frame the scopes are computed on
+SCOPE_VIEW_SIZE = 160 # On-screen size of each scope view
+SCOPE_NAMES = ("histogram", "waveform", "vectorscope")
+LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32) # Rec.709, RGB order
+
+
+def subsample_frame(frame, max_dim=SCOPE_SAMPLE_MAX_DIM):
+    """Returns a small strided copy of a frame so the scopes never touch full-resolution data."""
+    h, w = frame.shape[:2]
+    step = max(1, int(np.ceil(max(h, w) / float(max_dim))))
+    return frame[::step, ::step].copy()
+
+def _density_to_image(counts, color):
+    """Maps a 2D count array to an RGB uint8 image using log scaling."""
+    density = np.log1p(counts.astype(np.float32)); peak = density.max()
+    if peak > 0: density /= peak
+    return (density[:, :, None] * np.array(color, dtype=np.float32)).astype(np.uint8)
+
+def render_histogram(rgb, luma):
+    """Returns a 256x256 image with filled luma and R/G/B histograms blended additively."""
+    img = np.zeros((256, 256, 3), dtype=np.float32)
+    rows = np.arange(256)[:, None]
+    channels = ((luma, (110, 110, 110)), (rgb[:, :, 0], (150, 0, 0)), (rgb[:, :, 1], (0, 150, 0)), (rgb[:, :, 2], (0, 0, 150)))
+    for values, color in channels:
+        counts = np.bincount(values.ravel(), minlength=256).astype(np.float32); peak = counts.max()
+        heights = counts / peak * 255 if peak > 0 else counts
+        img[rows >= (255 - heights)[None, :]] += np.array(color, dtype=np.float32)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+def render_waveform(luma):
+    """Returns a 256x256 luma waveform: x follows image columns, y is the luma level."""
+    h, w = luma.shape
+    columns = np.broadcast_to((np.arange(w) * 256 // w)[None, :], (h, w))
+    levels = 255 - luma.astype(np.intp)
+    counts = np.bincount((levels * 256 + columns).ravel(), minlength=256 * 256).reshape(256, 256)
+    return _density_to_image(counts, (255, 102, 0))
+
+def _vectorscope_graticule():
+    yy, xx = np.mgrid[0:256, 0:256]
+    radius = np.hypot(xx - 127.5, yy - 127.5)
+    return (np.abs(radius - 127) < 0.75) | (np.abs(radius - 64) < 0.5) | (xx == 128) | (yy == 128)
+
+VECTORSCOPE_GRATICULE = _vectorscope_graticule()
+
+def render_vectorscope(rgb, luma_f):
+    """Returns a 256x256 Cb/Cr vectorscope (Rec.709) with a simple graticule."""
+    rgb_f = rgb.astype(np.float32)
+    cb = (rgb_f[:, :, 2] - luma_f) / 1.8556; cr = (rgb_f[:, :, 0] - luma_f) / 1.5748
+    u = np.clip(cb + 128, 0, 255).astype(np.intp); v = np.clip(128 - cr, 0, 255).astype(np.intp)
+    counts = np.bincount((v * 256 + u).ravel(), minlength=256 * 256).reshape(256, 256)
+    img = _density_to_image(counts, (255, 255, 255))
+    img[VECTORSCOPE_GRATICULE & (img.max(axis=2) < 60)] = (90, 40, 0)
+    return img
+
+def compute_scopes(sample, enabled):
+    """Computes the requested scopes for a (subsampled) BGR or grayscale frame.
+    Returns a dict mapping scope name to an RGB uint8 image."""
+    if sample.ndim == 2: sample = np.repeat(sample[:, :, None], 3, axis=2)
+    rgb = sample[:, :, 2::-1]
+    luma_f = rgb.astype(np.float32) @ LUMA_WEIGHTS
+    luma = np.clip(luma_f + 0.5, 0, 255).astype(np.uint8)
+    results = {}
+    if "histogram" in enabled: results["histogram"] = render_histogram(rgb, luma)
+    if "waveform" in enabled: results["waveform"] = render_waveform(luma)
+    if "vectorscope" in enabled: results["vectorscope"] = render_vectorscope(rgb, luma_f)
+    return results
+
+
+class ScopeWorker(QThread):
+    """Computes scope images off the GUI thread. Only the most recently submitted frame is kept,
+    so a slow computation never builds up a backlog."""
+    scopes_ready = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mutex = QMutex(); self._condition = QWaitCondition()
+        self._pending = None; self._stopping = False
+
+    def submit(self, sample, enabled):
+        self._mutex.lock()
+        self._pending = (sample, tuple(enabled)); self._condition.wakeOne()
+        self._mutex.unlock()
+
+    def stop(self):
+        self._mutex.lock()
+        self._stopping = True; self._condition.wakeOne()
+        self._mutex.unlock()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while self._pending is None and not self._stopping: self._condition.wait(self._mutex)
+            if self._stopping: self._mutex.unlock(); return
+            sample, enabled = self._pending; self._pending = None
+            self._mutex.unlock()
+            try: results = compute_scopes(sample, enabled)
+            except Exception as e: print(f"Error computing scopes: {e}"); continue
+            self.scopes_ready.emit(results)
+
+
+# ROI: Region-of-interest statistics over a frame range
+ROI_STATS_COLUMNS = ("frame", "mean", "min", "max", "std")
+ROI_PROGRESS_INTERVAL_S = 0.1 # How often the ROI worker reports progress to the GUI
+
+def map_display_rect_to_source(x, y, w, h, src_w, src_h, rotation_angle):
+    """Maps a rectangle in displayed (rotated) image coordinates back to source frame coordinates,
+    using the same angle -> rotation mapping as ROTATION_FOR_ANGLE."""
+    if rotation_angle == 90: return src_w - (y + h), x, h, w
+    if rotation_angle == 180: return src_w - (x + w), src_h - (y + h), w, h
+    if rotation_angle == 270: return y, src_h - (x + w), h, w
+    return x, y, w, h
+
+
+class VideoLabel(QLabel):
+    """Video display label that can optionally let the user drag out a rectangular ROI."""
+    roi_selected = pyqtSignal(QRect)
+
+    def __init__(self, text="", parent=None):
+        super().__init__(text, parent)
+        self.roi_mode = False
+        self._rubber_band = QRubberBand(QRubberBand.Rectangle, self)
+        self._origin = None
+
+    def set_roi_mode(self, enabled):
+        self.roi_mode = enabled; self._origin = None; self._rubber_band.hide()
+        self.setCursor(Qt.CrossCursor if enabled else Qt.ArrowCursor)
+
+    def mousePressEvent(self, event):
+        if self.roi_mode and event.button() == Qt.LeftButton:
+            self._origin = event.pos(); self._rubber_band.setGeometry(QRect(self._origin, QSize())); self._rubber_band.show()
+        else: super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._origin is not None: self._rubber_band.setGeometry(QRect(self._origin, event.pos()).normalized())
+        else: super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._origin is not None and event.button() == Qt.LeftButton:
+            rect = QRect(self._origin, event.pos()).normalized(); self._origin = None; self._rubber_band.hide()
+            self.roi_selected.emit(rect)
+        else: super().mouseReleaseEvent(event)
+
+
+class RoiStatsWorker(QThread):
+    """Streams a frame range through its own VideoCapture and records luma mean/min/max/std of the ROI.
+    Each frame is cropped before any conversion and then discarded, so memory stays flat;
+    only the (N, 5) result array grows with the range."""
+    progress = pyqtSignal(int)
+    stats_finished = pyqtSignal(int, bool)
+    stats_failed = pyqtSignal(str)
+
+    def __init__(self, file_path, roi, start_frame, end_frame, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path; self.roi = roi
+        self.start_frame = start_frame; self.end_frame = end_frame
+        self.results = np.full((end_frame - start_frame + 1, len(ROI_STATS_COLUMNS)), np.nan)
+        self.frames_done = 0
+
+    def run(self):
+        cap = cv2.VideoCapture(self.file_path, cv2.CAP_ANY)
+        if not cap.isOpened(): self.stats_failed.emit("UNABLE TO OPEN VIDEO FILE (OpenCV)"); self.stats_finished.emit(0, False); return
+        x, y, w, h = self.roi; bgr_luma_weights = LUMA_WEIGHTS[::-1].astype(np.float64)
+        last_progress_time = time.monotonic()
+        try:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+            for i in range(len(self.results)):
+                if self.isInterruptionRequested(): break
+                ret, frame = cap.read()
+                if not ret: break
+                crop = frame[y:y + h, x:x + w]
+                # float64 keeps mean/std consistent with min/max (float32 drifts on flat patches)
+                values = crop[:, :, :3].astype(np.float64) @ bgr_luma_weights if crop.ndim == 3 else crop.astype(np.float64)
+                self.results[i] = (self.start_frame + i, values.mean(), values.min(), values.max(), values.std())
+                self.frames_done = i + 1
+                now = time.monotonic()
+                if now - last_progress_time >= ROI_PROGRESS_INTERVAL_S: last_progress_time = now; self.progress.emit(self.frames_done)
+        except Exception as e: print(f"Error during ROI pass: {e}"); self.stats_failed.emit(f"ROI PASS ERROR: {e}")
+        finally: cap.release()
+        self.stats_finished.emit(self.frames_done, self.frames_done == len(self.results))
+
+
+class TimeSeriesPlot(QWidget):
+    """Draws the ROI mean as a line over a min/max band. Long series are reduced to one bucket per pixel column."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data = None; self.count = 0
+        self.setMinimumSize(600, 250)
+
+    def set_data(self, data, count):
+        self.data = data; self.count = count; self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self); painter.fillRect(self.rect(), QColor("#000000"))
+        painter.setPen(QPen(QColor("#444444"))); painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        if self.data is None or self.count < 1: painter.end(); return
+        width = max(1, self.width() - 2); height = max(1, self.height() - 2)
+        starts = np.unique(np.linspace(0, self.count, min(self.count, width), endpoint=False).astype(np.intp))
+        sizes = np.diff(np.append(starts, self.count))
+        means = np.add.reduceat(self.data[:self.count, 1], starts) / sizes
+        mins = np.minimum.reduceat(self.data[:self.count, 2], starts); maxs = np.maximum.reduceat(self.data[:self.count, 3], starts)
+        low = float(mins.min()); high = float(maxs.max())
+        if high - low < 1e-6: low -= 1; high += 1
+        xs = 1 + np.arange(len(starts)) * (width - 1) / max(1, len(starts) - 1)
+        to_y = lambda v: 1 + (high - v) / (high - low) * (height - 1)
+        painter.setPen(QPen(QColor(255, 102, 0, 90)))
+        for x, lo, hi in zip(xs, to_y(mins), to_y(maxs)): painter.drawLine(QPointF(x, lo), QPointF(x, hi))
+        painter.setPen(QPen(QColor("#ff6600"), 1.5))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, to_y(means))]))
+        painter.setPen(QPen(QColor("#aaaaaa")))
+        painter.drawText(5, 15, f"{high:.1f}"); painter.drawText(5, self.height() - 5, f"{low:.1f}")
+        painter.end()
+
+
+class RoiStatsDialog(QDialog):
+    """Runs a RoiStatsWorker, plots its results as they arrive and exports them as CSV."""
+    def __init__(self, file_path, roi, start_frame, end_frame, parent=None):
+        super().__init__(parent)
+        x, y, w, h = roi
+        self.setWindowTitle(f"ROI STATS: {os.path.basename(file_path)} [{x},{y} {w}x{h}] FRAMES {start_frame}-{end_frame}")
+        layout = QVBoxLayout(self)
+        self.plot = TimeSeriesPlot(); layout.addWidget(self.plot, 1)
+        self.info_label = QLabel("ROI PASS RUNNING..."); self.info_label.setObjectName("statusLabel"); layout.addWidget(self.info_label)
+        buttons_layout = QHBoxLayout(); buttons_layout.addStretch(1)
+        self.cancel_button = QPushButton("CANCEL"); self.cancel_button.clicked.connect(self.cancel); buttons_layout.addWidget(self.cancel_button)
+        self.export_button = QPushButton("EXPORT CSV"); self.export_button.setEnabled(False); self.export_button.clicked.connect(self.export_csv); buttons_layout.addWidget(self.export_button)
+        layout.addLayout(buttons_layout)
+        self.file_path = file_path
+        self.worker = RoiStatsWorker(file_path, roi, start_frame, end_frame, self)
+        self.worker.progress.connect(self.handle_progress)
+        self.worker.stats_finished.connect(self.handle_finished)
+        self.worker.stats_failed.connect(self.handle_failed)
+        self.error_message = None
+        self.worker.start()
+
+    def handle_progress(self, frames_done):
+        self.plot.set_data(self.worker.results, frames_done)
+        self.info_label.setText(f"ROI PASS RUNNING... {frames_done} / {len(self.worker.results)} FRAMES")
+
+    def handle_failed(self, message):
+        self.error_message = message
+
+    def handle_finished(self, frames_done, completed):
+        self.plot.set_data(self.worker.results, frames_done)
+        state = "COMPLETE" if completed else (self.error_message or "STOPPED")
+        self.info_label.setText(f"ROI PASS {state}: {frames_done} / {len(self.worker.results)} FRAMES")
+        self.cancel_button.setEnabled(False); self.export_button.setEnabled(frames_done > 0)
+
+    def cancel(self):
+        self.worker.requestInterruption()
+
+    def stop_worker(self):
+        self.worker.requestInterruption(); self.worker.wait()
+
+    def export_csv(self):
+        base_name = os.path.splitext(self.file_path)[0] + "_roi.csv"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export ROI Statistics", base_name, "CSV Files (*.csv);;All Files (*)")
+        if not file_path: return
+        try:
+            np.savetxt(file_path, self.worker.results[:self.worker.frames_done], delimiter=",", header=",".join(ROI_STATS_COLUMNS),
+                       comments="", fmt=["%d", "%.4f", "%.4f", "%.4f", "%.4f"])
+            self.info_label.setText(f"EXPORTED: {file_path}")
+        except Exception as e: print(f"Error exporting ROI statistics: {e}"); self.info_label.setText(f"EXPORT FAILED: {e}")
+
+    def done(self, result):
+        # Esc/reject() hides the dialog without a closeEvent, so the worker is stopped here
+        self.stop_worker()
+        super().done(result)
+
+    def closeEvent(self, event):
+        self.stop_worker()
+        super().closeEvent(event)
+
+
+def probe_capture(cap):
+    """Reads total frame count, FPS and orientation metadata from an opened capture.
+    Returns the raw values; callers apply their own fallbacks."""
+    # Note: the raw EXIF orientation code (1, 3, 6, 8) is stored as-is, not converted to degrees.
+    try:
+        orientation_raw = cap.get(cv2.CAP_PROP_ORIENTATION_META)
+        print(f"Raw orientation metadata: {orientation_raw} (type: {type(orientation_raw)})")
+        rotation_angle = int(orientation_raw) if orientation_raw is not None else 0
+        print(f"Stored orientation metadata value: {rotation_angle}")
+    except Exception as e:
+        print(f"Error getting or processing orientation metadata (cv2.CAP_PROP_ORIENTATION_META): {e}")
+        rotation_angle = 0
+    return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS), rotation_angle
+
+
+class PreloadedClip:
+    """An opened, probed capture whose first frame has already been decoded."""
+    def __init__(self, file_path, cap=None, total_frames=0, fps=0, rotation_angle=0, first_frame=None):
+        self.file_path = file_path; self.cap = cap
+        self.total_frames = total_frames; self.fps = fps; self.rotation_angle = rotation_angle
+        self.first_frame = first_frame
+
+    def release(self):
+        if self.cap is not None: self.cap.release(); self.cap = None
+
+
+class ClipPreloader(QThread):
+    """Opens, probes and decodes frame 0 of a playlist neighbour in the background.
+    Always emits clip_ready; clip.cap is None if the file could not be opened.
+    The clip is also kept on self.clip so it can be released if clip_ready is never delivered."""
+    clip_ready = pyqtSignal(object)
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.clip = PreloadedClip(file_path)
+
+    def run(self):
+        clip = self.clip
+        try:
+            cap = cv2.VideoCapture(self.file_path, cv2.CAP_ANY)
+            if cap.isOpened():
+                clip.total_frames, clip.fps, clip.rotation_angle = probe_capture(cap)
+                ret, frame = cap.read()
+                clip.cap = cap; clip.first_frame = frame if ret else None
+                print(f"Preloaded clip: {self.file_path}")
+            else: cap.release(); print(f"Preload failed to open: {self.file_path}")
+        except Exception as e: print(f"Error preloading {self.file_path}: {e}"); clip.release()
+        self.clip_ready.emit(clip)
+
 
 class VideoPlayer(QMainWindow):
     def __init__(self):
@@ -57,13 +391,32 @@ class VideoPlayer(QMainWindow):
         self.volume_value_label = None
         self.recent_button = None
         self.recent_menu = None
+        self.scopes_button = None
+        self.scopes_frame = None
+        self.scope_views = {}
+        self.scope_checkboxes = {}
+        self.scope_rate_spin = None
+        self.last_scope_submit_time = 0.0
+        self.roi_button = None
+        self.roi_dialog = None
+        # PLAYLIST: Sibling video files of the current file and their background preloads
+        self.playlist = []
+        self.playlist_path = None
+        self.preloaded_clips = {}
+        self.preload_workers = {}
 
         self.settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
         self.recent_files = []
+        self.scope_rate = DEFAULT_SCOPE_RATE_HZ
         self.load_settings()
 
         self.init_ui()
 
+        # SCOPES: Worker thread that computes histogram/waveform/vectorscope
+        self.scope_worker = ScopeWorker(self)
+        self.scope_worker.scopes_ready.connect(self.show_scopes)
+        self.scope_worker.start()
+
         # Timer for video playback
         self.timer = QTimer(self)
         # FIX 1: Use Qt.PreciseTimer for better timing accuracy
@@ -73,7 +426,6 @@ class VideoPlayer(QMainWindow):
         self.setup_shortcuts()
 
     def apply_nerv_style(self):
-        # (StyleSheet remains the same)
         self.setStyleSheet("""
             QMainWindow {
                 background-color: #1a1a1a;
@@ -113,6 +465,10 @@ class VideoPlayer(QMainWindow):
             QPushButton#openButton, QPushButton#recentButton { /* RECENT: Apply style to recent button */
                  min-width: 120px; /* Ensure Open/Recent buttons have enough space */
             }
+            QPushButton:checked { /* SCOPES: Toggle buttons stay highlighted while active */
+                background-color: #ff6600;
+                color: #000000;
+            }
 
             QSlider::groove:horizontal {
                 border: 1px solid #ff6600;
@@ -149,7 +505,7 @@ class VideoPlayer(QMainWindow):
                 background-color: #000000; /* Black background for video area */
             }
              /* Style for Info/Control Frames */
-            QFrame#infoFrame, QFrame#controlsVolumeFrame {
+            QFrame#infoFrame, QFrame#controlsVolumeFrame, QFrame#scopesFrame {
                 border: 1px solid #444444; /* Subtle border for control areas */
                 border-radius: 3px;
                 padding: 5px;
@@ -178,6 +534,28 @@ class VideoPlayer(QMainWindow):
                 border-radius: 3px;
                 text-align: center; /* Center align text */
             }
+            /* SCOPES: Style for the scope views and their controls */
+            QLabel#scopeView {
+                border: 1px solid #444444;
+                background-color: #000000;
+            }
+            QCheckBox {
+                font-weight: bold;
+            }
+            QCheckBox::indicator {
+                width: 10px;
+                height: 10px;
+                border: 1px solid #ff6600;
+                background-color: #2a2a2a;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #ff6600;
+            }
+            QSpinBox {
+                background-color: #2a2a2a;
+                border: 1px solid #ff6600;
+                padding: 1px 3px;
+            }
             /* RECENT: Style for the Recent Files Menu */
             QMenu {
                 background-color: #2a2a2a;
@@ -199,7 +577,6 @@ class VideoPlayer(QMainWindow):
         """)
 
     def setup_shortcuts(self):
-        # (Shortcuts remain the same)
         self.shortcut_next = QShortcut(QKeySequence(Qt.Key_Right), self)
         self.shortcut_next.activated.connect(self.next_frame)
         self.shortcut_prev = QShortcut(QKeySequence(Qt.Key_Left), self)
@@ -208,9 +585,16 @@ class VideoPlayer(QMainWindow):
         self.shortcut_play.activated.connect(self.toggle_play)
         self.shortcut_open = QShortcut(QKeySequence.Open, self)
         self.shortcut_open.activated.connect(self.open_file_dialog)
+        self.shortcut_scopes = QShortcut(QKeySequence(Qt.Key_S), self)
+        self.shortcut_scopes.activated.connect(self.scopes_button.toggle)
+        self.shortcut_roi = QShortcut(QKeySequence(Qt.Key_R), self)
+        self.shortcut_roi.activated.connect(self.roi_button.click)
+        self.shortcut_next_file = QShortcut(QKeySequence(Qt.Key_PageDown), self)
+        self.shortcut_next_file.activated.connect(self.next_file)
+        self.shortcut_prev_file = QShortcut(QKeySequence(Qt.Key_PageUp), self)
+        self.shortcut_prev_file.activated.connect(self.prev_file)
 
     def init_ui(self):
-        # (UI Initialization remains the same)
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
         main_layout = QVBoxLayout(main_widget)
@@ -221,10 +605,13 @@ class VideoPlayer(QMainWindow):
         main_layout.addWidget(nerv_header)
         video_frame = QFrame(); video_frame.setObjectName("videoFrame"); video_frame.setFrameShape(QFrame.StyledPanel)
         video_layout = QVBoxLayout(video_frame); video_layout.setContentsMargins(0, 0, 0, 0)
-        self.video_label = QLabel("DRAG & DROP VIDEO FILE HERE\nOR PRESS CTRL+O")
+        self.video_label = VideoLabel("DRAG & DROP VIDEO FILE HERE\nOR PRESS CTRL+O"); self.video_label.roi_selected.connect(self.handle_roi_selected)
         self.video_label.setAlignment(Qt.AlignCenter); self.video_label.setMinimumSize(640, 360)
         self.video_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding); self.video_label.setAcceptDrops(True)
-        video_layout.addWidget(self.video_label); main_layout.addWidget(video_frame, 1)
+        video_layout.addWidget(self.video_label)
+        video_scopes_layout = QHBoxLayout(); video_scopes_layout.setSpacing(10)
+        video_scopes_layout.addWidget(video_frame, 1); video_scopes_layout.addWidget(self.init_scopes_panel())
+        main_layout.addLayout(video_scopes_layout, 1)
         timeline_frame = QFrame(); timeline_frame.setObjectName("infoFrame")
         timeline_layout = QHBoxLayout(timeline_frame); timeline_label = QLabel("TIMELINE:")
         timeline_label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed); timeline_layout.addWidget(timeline_label)
@@ -246,6 +633,10 @@ class VideoPlayer(QMainWindow):
         self.recent_button = QPushButton("RECENT"); self.recent_button.setObjectName("recentButton"); self.recent_button.setToolTip("Open a recently used video file")
         self.recent_menu = QMenu(self); self.recent_button.clicked.connect(self.show_recent_files_menu)
         self.recent_button.setEnabled(bool(self.recent_files)); main_controls_layout.addWidget(self.recent_button)
+        self.scopes_button = QPushButton("SCOPES [S]"); self.scopes_button.setObjectName("scopesButton"); self.scopes_button.setToolTip("Show/Hide Histogram, Waveform and Vectorscope (S)")
+        self.scopes_button.setCheckable(True); self.scopes_button.toggled.connect(self.toggle_scopes); main_controls_layout.addWidget(self.scopes_button)
+        self.roi_button = QPushButton("ROI [R]"); self.roi_button.setObjectName("roiButton"); self.roi_button.setToolTip("Draw a region on the video to extract per-frame statistics (R)")
+        self.roi_button.setCheckable(True); self.roi_button.setEnabled(False); self.roi_button.toggled.connect(self.toggle_roi_mode); main_controls_layout.addWidget(self.roi_button)
         self.frame_counter = QLabel("FRAME: - / -"); self.frame_counter.setObjectName("frameCounterLabel"); self.frame_counter.setToolTip("Current Frame / Total Frames")
         main_controls_layout.addWidget(self.frame_counter); main_controls_layout.addStretch(1); controls_volume_layout.addLayout(main_controls_layout); controls_volume_layout.addStretch(1)
         volume_layout = QHBoxLayout(); volume_layout.setSpacing(5)
@@ -263,6 +654,25 @@ class VideoPlayer(QMainWindow):
         main_layout.addWidget(self.status_label)
         self.set_volume(self.volume_slider.value())
 
+    def init_scopes_panel(self):
+        """Builds the (initially hidden) scopes side panel."""
+        self.scopes_frame = QFrame(); self.scopes_frame.setObjectName("scopesFrame")
+        scopes_layout = QVBoxLayout(self.scopes_frame); scopes_layout.setSpacing(4)
+        titles = {"histogram": "HISTOGRAM", "waveform": "WAVEFORM", "vectorscope": "VECTORSCOPE"}
+        for name in SCOPE_NAMES:
+            checkbox = QCheckBox(titles[name]); checkbox.setChecked(True); checkbox.toggled.connect(self.refresh_scopes)
+            view = QLabel(); view.setObjectName("scopeView"); view.setFixedSize(SCOPE_VIEW_SIZE, SCOPE_VIEW_SIZE); view.setAlignment(Qt.AlignCenter)
+            scopes_layout.addWidget(checkbox); scopes_layout.addWidget(view)
+            self.scope_checkboxes[name] = checkbox; self.scope_views[name] = view
+        rate_layout = QHBoxLayout(); rate_label = QLabel("RATE (HZ):"); rate_layout.addWidget(rate_label)
+        self.scope_rate_spin = QSpinBox(); self.scope_rate_spin.setRange(1, 60); self.scope_rate_spin.setValue(self.scope_rate)
+        self.scope_rate_spin.setToolTip("Maximum scope update rate during playback (arrows or mouse wheel)"); self.scope_rate_spin.valueChanged.connect(self.set_scope_rate)
+        # Never take keyboard focus, otherwise the spin box swallows the player hotkeys (arrows, Space, S, R)
+        self.scope_rate_spin.setFocusPolicy(Qt.NoFocus); self.scope_rate_spin.lineEdit().setFocusPolicy(Qt.NoFocus); self.scope_rate_spin.lineEdit().setReadOnly(True)
+        rate_layout.addWidget(self.scope_rate_spin); scopes_layout.addLayout(rate_layout); scopes_layout.addStretch(1)
+        self.scopes_frame.setVisible(False)
+        return self.scopes_frame
+
 
     def dragEnterEvent(self, event: 'QDragEnterEvent'):
         # (Remains the same)
@@ -309,10 +719,20 @@ class VideoPlayer(QMainWindow):
             if file_path in self.recent_files:
                 self.recent_files.remove(file_path); self.save_settings()
                 self.recent_button.setEnabled(bool(self.recent_files))
+            if file_path in self.playlist and file_path != self.playlist_path: self.playlist.remove(file_path)
+            stale_clip = self.preloaded_clips.pop(file_path, None)
+            if stale_clip is not None: stale_clip.release()
+            self.schedule_preloads()
             return
 
         self.status_label.setText("LOADING VIDEO FILE...")
         QApplication.processEvents()
+        self.update_playlist(file_path)
+        clip = self.preloaded_clips.pop(file_path, None)
+        if clip is None and file_path in self.preload_workers:
+            # Preload still running: wait for it instead of opening the file a second time
+            worker = self.preload_workers.pop(file_path); worker.wait(); worker.deleteLater()
+            clip = worker.clip if worker.clip.cap is not None else None
 
         self.pause_video()
         if self.media_player.state() != QMediaPlayer.StoppedState: self.media_player.stop()
@@ -325,43 +745,22 @@ class VideoPlayer(QMainWindow):
         if self.volume_value_label: self.volume_value_label.setVisible(True)
 
         self.current_video_path = file_path
-        self.cap = cv2.VideoCapture(file_path, cv2.CAP_ANY)
+        if clip is not None: self.cap = clip.cap; print(f"Using preloaded clip: {file_path}")
+        else: self.cap = cv2.VideoCapture(file_path, cv2.CAP_ANY)
 
         if not self.cap.isOpened():
             self.video_label.setText("ERROR: UNABLE TO OPEN VIDEO FILE (OpenCV)")
             self.status_label.setText("VIDEO LOAD FAILED (OpenCV)"); self.reset_ui()
+            self.schedule_preloads()
             return
-        
-        # IMPORTANT NOTE on ROTATION:
-        # The original code for rotation had a logical flaw in how it interpreted
-        # cv2.CAP_PROP_ORIENTATION_META and applied rotation.
-        # `orientation_raw` gives EXIF codes (1, 3, 6, 8).
-        # `self.rotation_angle` was set to this raw value.
-        # Then `display_frame` checked `if self.rotation_angle == 90/180/270`,
-        # which would almost never be true if `self.rotation_angle` holds an EXIF code.
-        # This means rotation was likely not being applied.
-        # For this fix, I'm focusing on the FPS issue. The rotation logic is left as is
-        # but be aware it likely doesn't work as intended and needs a separate fix.
-        try:
-            orientation_raw = self.cap.get(cv2.CAP_PROP_ORIENTATION_META)
-            print(f"Raw orientation metadata: {orientation_raw} (type: {type(orientation_raw)})")
-            # Storing the raw EXIF orientation value. The interpretation logic is in display_frame.
-            # To correctly fix rotation, you'd map these EXIF values (1,3,6,8)
-            # to actual rotation operations (e.g., cv2.ROTATE_ constants) or degrees.
-            # E.g. if orientation_raw is 6 (90 deg CW), set a flag or mapped angle.
-            # The current `self.rotation_angle` is compared to 90,180,270, which is likely incorrect.
-            self.rotation_angle = int(orientation_raw) if orientation_raw is not None else 0
-            print(f"Stored orientation metadata value: {self.rotation_angle}")
-        except Exception as e:
-            print(f"Error getting or processing orientation metadata (cv2.CAP_PROP_ORIENTATION_META): {e}")
-            self.rotation_angle = 0
+
+        if clip is not None: self.total_frames, self.fps, self.rotation_angle = clip.total_frames, clip.fps, clip.rotation_angle
+        else: self.total_frames, self.fps, self.rotation_angle = probe_capture(self.cap)
 
         self.update_recent_files(file_path)
 
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
         if self.total_frames <= 0: self.status_label.setText("WARNING: Could not read total frame count accurately."); self.total_frames = 0
 
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
         if self.fps <= 0: self.status_label.setText("WARNING: Could not read FPS accurately. Using default 30 FPS."); self.fps = 30
         else:
              print(f"Video FPS detected: {self.fps}")
@@ -375,17 +774,85 @@ class VideoPlayer(QMainWindow):
 
         self.play_button.setEnabled(True); self.play_button.setText("▶ PLAY [SPACE]")
         self.next_button.setEnabled(True); self.prev_button.setEnabled(True)
+        self.roi_button.setEnabled(True)
 
         self.setup_audio(file_path)
-        self.set_frame_position(0)
+        if clip is not None and clip.first_frame is not None:
+            # PLAYLIST: Frame 0 was already decoded in the background; the capture is positioned at frame 1
+            self.display_frame(clip.first_frame); self.update_frame_counter()
+        else: self.set_frame_position(0)
         self.status_label.setText(f"VIDEO LOADED: {os.path.basename(file_path)}")
         self.video_label.setText("")
+        self.schedule_preloads()
+
+    def update_playlist(self, file_path):
+        """Makes file_path the current playlist entry, rebuilding the playlist from its folder if needed."""
+        if file_path not in self.playlist:
+            folder = os.path.dirname(file_path) or "."
+            # Keep the separator style of file_path so entries compare equal to it (and to RECENT entries)
+            prefix = file_path[:len(file_path) - len(os.path.basename(file_path))]
+            try: names = os.listdir(folder)
+            except OSError as e: print(f"Error listing playlist folder {folder}: {e}"); names = []
+            supported = self.get_supported_formats()
+            self.playlist = [prefix + name for name in sorted(names, key=str.lower)
+                             if os.path.splitext(name)[1].lower() in supported and os.path.isfile(os.path.join(folder, name))]
+            if file_path not in self.playlist: self.playlist.append(file_path)
+            print(f"Playlist rebuilt with {len(self.playlist)} files from: {folder}")
+        self.playlist_path = file_path
+
+    def get_adjacent_files(self):
+        """Returns the next and previous playlist entries (whichever exist)."""
+        if self.playlist_path not in self.playlist: return []
+        index = self.playlist.index(self.playlist_path)
+        return [self.playlist[i] for i in (index + 1, index - 1) if 0 <= i < len(self.playlist)]
+
+    def schedule_preloads(self):
+        """Keeps the playlist neighbours of the current file preloaded and releases everything else."""
+        # A neighbour whose preload is still in flight is adopted by load_video (it waits on the worker),
+        # so switching early never opens the same file twice.
+        neighbours = self.get_adjacent_files()
+        for path in list(self.preloaded_clips):
+            if path not in neighbours: self.preloaded_clips.pop(path).release()
+        for path in neighbours:
+            if path in self.preloaded_clips or path in self.preload_workers: continue
+            worker = ClipPreloader(path, self); worker.clip_ready.connect(self.handle_clip_preloaded)
+            self.preload_workers[path] = worker; worker.start()
+
+    def handle_clip_preloaded(self, clip):
+        worker = self.preload_workers.get(clip.file_path)
+        if worker is None or worker.clip is not clip: return # Already adopted by load_video
+        del self.preload_workers[clip.file_path]; worker.wait(); worker.deleteLater()
+        if clip.cap is not None and clip.file_path in self.get_adjacent_files() and clip.file_path not in self.preloaded_clips:
+            self.preloaded_clips[clip.file_path] = clip
+        else: clip.release()
+
+    def next_file(self):
+        self.open_adjacent_file(1)
+
+    def prev_file(self):
+        self.open_adjacent_file(-1)
+
+    def open_adjacent_file(self, step):
+        if self.playlist_path not in self.playlist: self.status_label.setText("NO PLAYLIST: Open a video file first"); return
+        index = self.playlist.index(self.playlist_path)
+        # Prune siblings deleted since the playlist was built, so a missing file does not reset the current clip
+        pruned = False
+        while 0 <= index + step < len(self.playlist) and not os.path.exists(self.playlist[index + step]):
+            missing_path = self.playlist.pop(index + step); pruned = True; print(f"Playlist file no longer exists, skipping: {missing_path}")
+            stale_clip = self.preloaded_clips.pop(missing_path, None)
+            if stale_clip is not None: stale_clip.release()
+            if step < 0: index -= 1
+        index += step
+        if not 0 <= index < len(self.playlist):
+            if pruned: self.schedule_preloads()
+            self.status_label.setText("ALREADY AT LAST FILE IN FOLDER" if step > 0 else "ALREADY AT FIRST FILE IN FOLDER"); return
+        self.load_video(self.playlist[index])
 
     def reset_ui(self):
-        # (Remains the same)
         print("Resetting UI elements (disabling controls)...")
         self.play_button.setEnabled(False); self.play_button.setText("▶ PLAY [SPACE]")
         self.next_button.setEnabled(False); self.prev_button.setEnabled(False)
+        self.roi_button.setChecked(False); self.roi_button.setEnabled(False)
         self.timeline_slider.setEnabled(False); self.timeline_slider.setValue(0)
         self.frame_counter.setText("FRAME: - / -")
         self.current_frame = 0; self.total_frames = 0; self.fps = 0
@@ -401,7 +868,6 @@ class VideoPlayer(QMainWindow):
 
 
     def load_settings(self):
-        # (Remains the same)
         print("Loading settings...")
         files = self.settings.value(RECENT_FILES_KEY, [], type=list)
         seen_files = set(); valid_files = []
@@ -410,11 +876,12 @@ class VideoPlayer(QMainWindow):
                 valid_files.append(f); seen_files.add(f)
         self.recent_files = valid_files[:MAX_RECENT_FILES]
         print(f"Loaded {len(self.recent_files)} recent files.")
+        self.scope_rate = max(1, min(60, self.settings.value(SCOPE_RATE_KEY, DEFAULT_SCOPE_RATE_HZ, type=int)))
 
     def save_settings(self):
-        # (Remains the same)
         print(f"Saving {len(self.recent_files)} recent files...")
-        self.settings.setValue(RECENT_FILES_KEY, self.recent_files); self.settings.sync()
+        self.settings.setValue(RECENT_FILES_KEY, self.recent_files)
+        self.settings.setValue(SCOPE_RATE_KEY, self.scope_rate); self.settings.sync()
 
     def update_recent_files(self, file_path):
         # (Remains the same)
@@ -515,9 +982,10 @@ class VideoPlayer(QMainWindow):
     def display_frame(self, frame_data):
         if frame_data is None: print("Warning: display_frame called with None data."); return
         self.current_frame_data = frame_data.copy()
+        self.update_scopes(frame_data)
         
         rotated_frame = frame_data 
-        # As noted in load_video, this rotation logic likely needs a more robust fix
+        # As noted in probe_capture, this rotation logic likely needs a more robust fix
         # to correctly interpret self.rotation_angle based on EXIF codes (1,3,6,8).
         # The current conditions (==90, ==180, ==270) might not match the stored EXIF code directly.
         # E.g., EXIF '6' means 90 deg CW. self.rotation_angle would be 6.
@@ -528,13 +996,9 @@ class VideoPlayer(QMainWindow):
         # elif self.rotation_angle == 8: # (mapped from EXIF 8 for 90 degrees CCW / 270 CW)
         #    rotated_frame = cv2.rotate(frame_data, ROTATE_90_COUNTERCLOCKWISE)
 
-        # Original (likely flawed) rotation logic based on direct degree comparison:
-        if self.rotation_angle == 90: # This implies self.rotation_angle was set to 90, not an EXIF code
-            rotated_frame = cv2.rotate(frame_data, ROTATE_90_COUNTERCLOCKWISE)
-        elif self.rotation_angle == 180: # This implies self.rotation_angle was set to 180
-            rotated_frame = cv2.rotate(frame_data, ROTATE_180)
-        elif self.rotation_angle == 270: # This implies self.rotation_angle was set to 270
-            rotated_frame = cv2.rotate(frame_data, ROTATE_90_CLOCKWISE)
+        # Original (likely flawed) rotation logic based on direct degree comparison (90/180/270, not EXIF codes):
+        if self.rotation_angle in ROTATION_FOR_ANGLE:
+            rotated_frame = cv2.rotate(frame_data, ROTATION_FOR_ANGLE[self.rotation_angle])
             
         frame_processed = rotated_frame
 
@@ -613,13 +1077,48 @@ class VideoPlayer(QMainWindow):
 
 
     def pause_video(self):
-        # (Remains the same)
         if not self.is_playing and not self.timer.isActive(): return # Already paused or timer stopped
         print("Pausing video/audio..."); self.is_playing = False
         self.play_button.setText("▶ PLAY [SPACE]"); self.play_button.setToolTip("Play Video (Spacebar)")
         if self.timer.isActive(): self.timer.stop();
         if self.media_player.state() == QMediaPlayer.PlayingState: self.media_player.pause()
         self.status_label.setText("PLAYBACK PAUSED")
+        # SCOPES: Playback updates are throttled, so make sure the paused frame is analysed
+        self.update_scopes(self.current_frame_data, force=True)
+
+    def toggle_scopes(self, visible):
+        if self.scopes_frame: self.scopes_frame.setVisible(visible)
+        if visible: self.refresh_scopes()
+
+    def set_scope_rate(self, rate):
+        self.scope_rate = rate
+
+    def refresh_scopes(self):
+        """Recomputes the scopes for the current frame immediately (e.g. after toggling a scope)."""
+        for name, view in self.scope_views.items():
+            if not self.scope_checkboxes[name].isChecked(): view.clear()
+        self.update_scopes(self.current_frame_data, force=True)
+
+    def update_scopes(self, frame_data, force=False):
+        """Hands a subsampled copy of the frame to the scope worker.
+        During playback submissions are throttled to self.scope_rate; paused/stepping updates are immediate."""
+        if frame_data is None or not self.scopes_frame or not self.scopes_frame.isVisible(): return
+        enabled = [name for name in SCOPE_NAMES if self.scope_checkboxes[name].isChecked()]
+        if not enabled: return
+        now = time.monotonic()
+        if self.is_playing and not force and now - self.last_scope_submit_time < 1.0 / self.scope_rate: return
+        self.last_scope_submit_time = now
+        sample = subsample_frame(frame_data)
+        if self.rotation_angle in ROTATION_FOR_ANGLE: sample = cv2.rotate(sample, ROTATION_FOR_ANGLE[self.rotation_angle])
+        self.scope_worker.submit(sample, enabled)
+
+    def show_scopes(self, results):
+        for name, image in results.items():
+            view = self.scope_views.get(name)
+            if view is None or not self.scope_checkboxes[name].isChecked(): continue
+            h, w, ch = image.shape
+            q_image = QImage(image.data, w, h, ch * w, QImage.Format_RGB888).copy()
+            view.setPixmap(QPixmap.fromImage(q_image).scaled(view.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
 
 
     def next_frame(self):
@@ -690,6 +1189,39 @@ class VideoPlayer(QMainWindow):
                  else: self.play_button.setText("▶ PLAY [SPACE]"); self.play_button.setToolTip("Play Video (Spacebar)"); self.status_label.setText("VIDEO END REACHED")
         self.was_playing_before_slider_press = False
 
+    def toggle_roi_mode(self, enabled):
+        if enabled and self.cap is None: self.roi_button.setChecked(False); return
+        if enabled and self.is_playing: self.pause_video()
+        self.video_label.set_roi_mode(enabled)
+        if enabled: self.status_label.setText("ROI MODE: Drag a rectangle on the video")
+
+    def label_rect_to_frame_rect(self, rect):
+        """Converts a rectangle in video_label coordinates to (x, y, w, h) in source frame pixels, or None."""
+        pixmap = self.video_label.pixmap()
+        if self.current_frame_data is None or pixmap is None or pixmap.isNull(): return None
+        src_h, src_w = self.current_frame_data.shape[:2]
+        disp_w, disp_h = (src_h, src_w) if self.rotation_angle in (90, 270) else (src_w, src_h)
+        offset_x = (self.video_label.width() - pixmap.width()) / 2.0; offset_y = (self.video_label.height() - pixmap.height()) / 2.0
+        scale = disp_w / float(pixmap.width())
+        x0 = int(np.clip((rect.left() - offset_x) * scale, 0, disp_w)); x1 = int(np.clip((rect.right() + 1 - offset_x) * scale, 0, disp_w))
+        y0 = int(np.clip((rect.top() - offset_y) * scale, 0, disp_h)); y1 = int(np.clip((rect.bottom() + 1 - offset_y) * scale, 0, disp_h))
+        if x1 - x0 < 1 or y1 - y0 < 1: return None
+        return map_display_rect_to_source(x0, y0, x1 - x0, y1 - y0, src_w, src_h, self.rotation_angle)
+
+    def handle_roi_selected(self, rect):
+        self.roi_button.setChecked(False)
+        roi = self.label_rect_to_frame_rect(rect)
+        if roi is None: self.status_label.setText("ROI OUTSIDE VIDEO AREA"); return
+        if self.total_frames <= 0: self.status_label.setText("ROI STATS NEED A KNOWN FRAME COUNT"); return
+        last_frame = self.total_frames - 1
+        start_frame, ok = QInputDialog.getInt(self, "ROI Frame Range", "START FRAME:", self.current_frame, 0, last_frame)
+        if not ok: return
+        end_frame, ok = QInputDialog.getInt(self, "ROI Frame Range", "END FRAME:", last_frame, start_frame, last_frame)
+        if not ok: return
+        if self.roi_dialog is not None: self.roi_dialog.close(); self.roi_dialog.deleteLater()
+        self.roi_dialog = RoiStatsDialog(self.current_video_path, roi, start_frame, end_frame, self); self.roi_dialog.show()
+        self.status_label.setText(f"ROI PASS STARTED: FRAMES {start_frame}-{end_frame}")
+
     def update_frame_counter(self):
         # (Remains the same)
         total_display = self.total_frames - 1 if self.total_frames > 0 else "-"
@@ -704,8 +1236,12 @@ class VideoPlayer(QMainWindow):
             if hasattr(self, 'video_label') and self.video_label: self.display_frame(self.current_frame_data)
 
     def closeEvent(self, event):
-        # (Remains the same)
         print("Closing application..."); self.save_settings(); self.pause_video()
+        self.scope_worker.stop(); print("Scope worker stopped.")
+        if self.roi_dialog is not None: self.roi_dialog.close()
+        # Queued clip_ready signals are not delivered after close, so release in-flight preloads here
+        for worker in self.preload_workers.values(): worker.wait(); worker.clip.release()
+        for clip in self.preloaded_clips.values(): clip.release()
         if self.cap is not None: self.cap.release(); self.cap = None; print("Video capture released.")
         if self.media_player: self.media_player.stop(); self.media_player.setMedia(QMediaContent()); print("Media player stopped and cleared.")
         event.accept()